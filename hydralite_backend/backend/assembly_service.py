@@ -1,7 +1,10 @@
 import assemblyai as aai
 import os
+import logging
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 # ================= LOAD ENV =================
 load_dotenv()
 
@@ -14,55 +17,54 @@ if not ASSEMBLY_API_KEY:
 
 aai.settings.api_key = ASSEMBLY_API_KEY
 
+# ================= TRANSCRIPTION SETUP =================
+# 🔥 CRITICAL CONFIG FOR YOUR USE CASE
+_CONFIG = aai.TranscriptionConfig(
+    speaker_labels=True,        # REQUIRED for doctor/patient split
+    speakers_expected=2,        # Doctor + Patient
+    language_detection=True,    # Auto EN / HI
+    punctuate=True,
+    format_text=True,
+    disfluencies=False          # Cleaner medical text
+)
 
-# ================= TRANSCRIPTION =================
-def transcribe_audio(audio_path: str):
-    print("📤 AssemblyAI: preparing transcription")
-    print(f"🎧 Audio path: {audio_path}")
+# Reused across calls so the SDK's HTTP session stays warm
+_TRANSCRIBER = aai.Transcriber()
 
-    # 🔥 CRITICAL CONFIG FOR YOUR USE CASE
-    config = aai.TranscriptionConfig(
-        speaker_labels=True,        # REQUIRED for doctor/patient split
-        speakers_expected=2,        # Doctor + Patient
-        language_detection=True,    # Auto EN / HI
-        punctuate=True,
-        format_text=True,
-        disfluencies=False          # Cleaner medical text
-    )
 
-    transcriber = aai.Transcriber()
-
-    print("⏳ AssemblyAI: uploading & transcribing (this may take time)...")
-    transcript = transcriber.transcribe(audio_path, config)
+# ================= TRANSCRIPTION =================
+def transcribe_audio(audio_path: str):
+    logger.info(f"AssemblyAI: uploading & transcribing {audio_path}")
+    transcript = _TRANSCRIBER.transcribe(audio_path, _CONFIG)
 
     # ================= ERROR HANDLING =================
     if transcript.status == aai.TranscriptStatus.error:
-        print("❌ AssemblyAI error:", transcript.error)
+        logger.error(f"AssemblyAI error: {transcript.error}")
         raise RuntimeError(transcript.error)
 
-    print("✅ AssemblyAI transcription completed")
+    logger.info("AssemblyAI transcription completed")
 
     # ================= DEBUG LOGS =================
     # Language (may or may not exist depending on SDK/version)
     if hasattr(transcript, "language") and transcript.language:
-        print(f"🗣 AssemblyAI detected language: {transcript.language}")
+        logger.info(f"AssemblyAI detected language: {transcript.language}")
     elif hasattr(transcript, "language_code") and transcript.language_code:
-        print(f"🗣 AssemblyAI detected language: {transcript.language_code}")
+        logger.info(f"AssemblyAI detected language: {transcript.language_code}")
     else:
-        print("⚠️ AssemblyAI language not returned")
+        logger.warning("AssemblyAI language not returned")
 
     # Speaker diarization check
     if hasattr(transcript, "utterances") and transcript.utterances:
         speakers = {u.speaker for u in transcript.utterances}
-        print(f"🧑‍⚕️ Speakers detected: {', '.join(sorted(speakers))}")
-        print(f"🗣 Utterances count: {len(transcript.utterances)}")
+        logger.info(f"Speakers detected: {', '.join(sorted(speakers))}")
+        logger.info(f"Utterances count: {len(transcript.utterances)}")
     else:
-        print("⚠️ No utterances returned (speaker_labels may have failed)")
+        logger.warning("No utterances returned (speaker_labels may have failed)")
 
     # Transcript length
     if transcript.text:
-        print(f"📝 Transcript length: {len(transcript.text)} characters")
+        logger.info(f"Transcript length: {len(transcript.text)} characters")
     else:
-        print("⚠️ Empty transcript received")
+        logger.warning("Empty transcript received")
 
     return transcript
@@ -0,0 +1,54 @@
+import os
+from pathlib import Path
+from typing import Final
+from dotenv import load_dotenv
+
+# ================= LOAD ENV =================
+load_dotenv()
+
+# ================= CONFIGURATION =================
+# Shared by the API process and pipeline workers; constants only
+LOG_FORMAT: Final = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# FFmpeg paths - use system PATH in production
+FFMPEG_PATH: Final = os.getenv("FFMPEG_PATH", "ffmpeg")
+FFMPEG_TIMEOUT: Final = int(os.getenv("FFMPEG_TIMEOUT", "300"))
+
+# CORS origins - restrict in production
+ALLOWED_ORIGINS: Final = os.getenv("ALLOWED_ORIGINS", "*").split(",")
+
+# Directories
+BASE_DIR: Final = Path(__file__).parent
+UPLOAD_DIR: Final = BASE_DIR / "uploads"
+PROCESSED_DIR: Final = BASE_DIR / "processed"
+TRANSCRIPTS_DIR: Final = BASE_DIR / "transcripts"
+SUMMARIES_DIR: Final = BASE_DIR / "summaries"
+PDFS_DIR: Final = BASE_DIR / "pdfs"
+
+# Bluetooth directory - disable in production if not needed
+BLUETOOTH_DIR: Final = os.getenv("BLUETOOTH_DIR", "")
+ENABLE_BLUETOOTH_WATCHER: Final = os.getenv("ENABLE_BLUETOOTH_WATCHER", "false").lower() == "true"
+
+# Files
+STATUS_FILE: Final = BASE_DIR / "status.json"
+PROCESSED_LOG: Final = BASE_DIR / "processed_bluetooth.json"
+
+# Status store - "memory" (single API process) or "redis" (multi-worker)
+STATUS_BACKEND: Final = os.getenv("STATUS_BACKEND", "memory").lower()
+REDIS_URL: Final = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+STATUS_REDIS_KEY: Final = "status:current"
+STATUS_FLUSH_DELAY: Final = float(os.getenv("STATUS_FLUSH_DELAY", "1.0"))
+
+# File processing
+FILE_READY_TIMEOUT: Final = int(os.getenv("FILE_READY_TIMEOUT", "20"))
+BLUETOOTH_RESCAN_INTERVAL: Final = int(os.getenv("BLUETOOTH_RESCAN_INTERVAL", "60"))
+MAX_FILE_SIZE_MB: Final = int(os.getenv("MAX_FILE_SIZE_MB", "100"))
+UPLOAD_CHUNK_SIZE: Final = 8 * 1024 * 1024
+
+# Rate limiting
+MAX_CONCURRENT_PROCESSING: Final = int(os.getenv("MAX_CONCURRENT_PROCESSING", "3"))
+MAX_CONCURRENT_TRANSLATIONS: Final = int(os.getenv("MAX_CONCURRENT_TRANSLATIONS", "16"))
+
+# ================= FFMPEG SETUP =================
+if FFMPEG_PATH != "ffmpeg":
+    os.environ["PATH"] += os.pathsep + str(Path(FFMPEG_PATH).parent)
@@ -0,0 +1,12 @@
+import os
+from dotenv import load_dotenv
+from groq import Groq
+from http_pool import SHARED_HTTPX
+
+# ================= LOAD ENV =================
+load_dotenv()
+
+# ================= GROQ CLIENT =================
+# Single client shared by groq_service and language_service.
+# Retries are handled by retry_utils.with_retry, not the SDK
+client = Groq(api_key=os.getenv("GROQ_API_KEY"), http_client=SHARED_HTTPX, max_retries=0)
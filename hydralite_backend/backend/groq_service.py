@@ -1,34 +1,20 @@
-import os
 import json
-import re
-from dotenv import load_dotenv
-from groq import Groq
+import logging
+from groq_client import client
+from retry_utils import with_retry
 
-# ===============================
-# LOAD ENV
-# ===============================
-load_dotenv()
-
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+logger = logging.getLogger(__name__)
 
 # ===============================
-# LLAMA SUMMARY
+# SUMMARY PROMPT
 # ===============================
-def generate_summary(transcript_json: dict) -> dict:
-    utterances = transcript_json.get("utterances", [])
-
-    convo = []
-    chars = 0
-    for u in utterances:
-        line = f"{u['speaker']}: {u['text']}\n"
-        chars += len(line)
-        if chars > 6000:
-            break
-        convo.append(line)
+# Constant instructions + schema go first so every request shares an
+# identical prefix (Groq prompt caching); only the conversation varies
+SUMMARY_MODEL = "llama-3.1-8b-instant"
 
-    conversation = "".join(convo)
+_SUMMARY_SYSTEM = "You output ONLY valid JSON."
 
-    prompt = f"""
+_SUMMARY_PREFIX = """
 You are a medical summarization system.
 
 STRICT RULES:
@@ -37,7 +23,7 @@ STRICT RULES:
 - No explanations
 
 JSON FORMAT:
-{{
+{
   "doctor_summary": "",
   "symptoms": [],
   "patient_history": [],
@@ -45,30 +31,58 @@ JSON FORMAT:
   "prescription": [],
   "advice": [],
   "recommended_action": ""
-}}
+}
 
 Conversation:
-{conversation}
 """
 
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
+# ===============================
+# PROMPT CACHE WARMUP
+# ===============================
+def warm_summary_prefix():
+    """
+    Send the constant summary prefix once (1 output token) so it is
+    cached server-side by the time the transcript is ready.
+    Best effort: failures are logged and ignored.
+    """
+    try:
+        client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=[
+                {"role": "system", "content": _SUMMARY_SYSTEM},
+                {"role": "user", "content": _SUMMARY_PREFIX}
+            ],
+            max_tokens=1
+        )
+    except Exception as e:
+        logger.warning(f"Summary prefix warmup failed: {e}")
+
+# ===============================
+# LLAMA SUMMARY
+# ===============================
+def generate_summary(transcript_json: dict) -> dict:
+    utterances = transcript_json.get("utterances", [])
+
+    # Keep whole lines within a 6000 char budget
+    conversation = "".join([f"{u['speaker']}: {u['text']}\n" for u in utterances])[:6000]
+    conversation = conversation[:conversation.rfind("\n") + 1] or conversation
+
+    response = with_retry(
+        client.chat.completions.create,
+        model=SUMMARY_MODEL,
         messages=[
-            {"role": "system", "content": "You output ONLY valid JSON."},
-            {"role": "user", "content": prompt}
+            {"role": "system", "content": _SUMMARY_SYSTEM},
+            {"role": "user", "content": _SUMMARY_PREFIX + conversation + "\n"}
         ],
-        temperature=0.2
+        temperature=0.2,
+        response_format={"type": "json_object"},
+        max_tokens=1024
     )
 
     raw = response.choices[0].message.content.strip()
 
-    # ---- HARD JSON EXTRACTION SAFETY NET ----
+    # JSON mode guarantees a JSON object, no markdown extraction needed
     try:
-        data = json.loads(raw)
-    except Exception:
-        match = re.search(r"\{.*\}", raw, re.DOTALL)
-        if not match:
-            raise RuntimeError(f"Invalid LLM output:\n{raw}")
-        data = json.loads(match.group())
-
-    return data
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        raise RuntimeError(f"Invalid LLM output:\n{raw}")
@@ -0,0 +1,10 @@
+import httpx
+
+# ================= SHARED HTTP POOL =================
+# One keep-alive pool for every Groq call (summary + translation),
+# so dozens of requests per upload reuse warm TLS connections
+SHARED_HTTPX = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=300),
+    timeout=httpx.Timeout(60.0, connect=5.0),
+)
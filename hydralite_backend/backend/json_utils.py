@@ -0,0 +1,23 @@
+import json
+from pathlib import Path
+
+try:
+    import orjson  # C JSON encoder/decoder, optional
+except ImportError:
+    orjson = None
+
+# ================= JSON FILES =================
+def dump_json(obj, path: Path):
+    """Write indented UTF-8 JSON, via orjson when available"""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+
+def load_json(path: Path):
+    """Read a JSON file, via orjson when available"""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
@@ -1,11 +1,42 @@
 import os
-from dotenv import load_dotenv
-from groq import Groq
+import json
+import threading
+from collections import OrderedDict
+import groq
+from groq_client import client
+from retry_utils import with_retry
 
-# ================= LOAD ENV =================
-load_dotenv()
+# Identical phrases recur across patients; cache translations in memory.
+# Shared by translate_text and translate_batch, keyed by (text, target_lang)
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "4096"))
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+# ================= TRANSLATION CACHE =================
+def _cache_get(text: str, target_lang: str):
+    """Cached translation or None; a hit becomes most recently used"""
+    key = (text, target_lang)
+    with _CACHE_LOCK:
+        translated = _CACHE.get(key)
+        if translated is not None:
+            _CACHE.move_to_end(key)
+        return translated
+
+def _cache_put(text: str, target_lang: str, translated: str):
+    """Store a translation, evicting the least recently used beyond the limit"""
+    with _CACHE_LOCK:
+        _CACHE[(text, target_lang)] = translated
+        _CACHE.move_to_end((text, target_lang))
+        while len(_CACHE) > TRANSLATION_CACHE_SIZE:
+            _CACHE.popitem(last=False)
+
+def clear_translation_cache() -> int:
+    """Drop all cached translations, returns number of evicted entries"""
+    with _CACHE_LOCK:
+        entries = len(_CACHE)
+        _CACHE.clear()
+    return entries
 
 # ================= TEXT TRANSLATION =================
 def translate_text(text: str, target_lang: str) -> str:
@@ -31,6 +62,14 @@ def translate_text(text: str, target_lang: str) -> str:
     if not text or not text.strip():
         return text
 
+    translated = _cache_get(text, target_lang)
+    if translated is None:
+        translated = _translate_uncached(text, target_lang)
+        _cache_put(text, target_lang, translated)
+    return translated
+
+
+def _translate_uncached(text: str, target_lang: str) -> str:
     prompt = f"""
 Translate the following medical text into {target_lang}.
 
@@ -45,13 +84,104 @@ Text:
 {text}
 """
 
-    response = client.chat.completions.create(
+    request = dict(
         model="llama-3.1-8b-instant",
         messages=[
             {"role": "system", "content": "You are a medical translation engine."},
             {"role": "user", "content": prompt}
         ],
-        temperature=0.1
+        temperature=0.1,
+    )
+
+    response = with_retry(
+        client.chat.completions.create,
+        **request,
+        max_tokens=max(64, len(text) * 2)
     )
 
+    # The cap is sized from input characters; scripts like Tamil or Telugu
+    # can need several tokens per character, so redo a truncated reply uncapped
+    if response.choices[0].finish_reason == "length":
+        response = with_retry(client.chat.completions.create, **request)
+
     return response.choices[0].message.content.strip()
+
+
+# ================= BATCH TRANSLATION =================
+def _error_code(e: groq.APIStatusError):
+    """Groq error code from an API error body (e.g. json_validate_failed)"""
+    body = e.body if isinstance(e.body, dict) else {}
+    error = body.get("error", body)
+    return error.get("code") if isinstance(error, dict) else None
+
+
+def translate_batch(payload: dict, target_lang: str) -> dict:
+    """
+    Translate every value of a flat {key: text} dict in ONE request.
+
+    - Keys are returned unchanged, in the same order
+    - Only values missing from the translation cache are sent; the
+      results are cached per value
+    - Raises ValueError if the model does not return a valid JSON
+      object with the same keys (caller falls back to translate_text)
+    """
+
+    if not payload:
+        return {}
+
+    cached = {}
+    misses = {}
+    for k, text in payload.items():
+        translated = _cache_get(text, target_lang)
+        if translated is None:
+            misses[k] = text
+        else:
+            cached[k] = translated
+
+    if not misses:
+        return {k: cached[k] for k in payload}
+
+    prompt = f"""
+Translate each value of the following JSON into {target_lang}.
+
+STRICT RULES:
+- Return JSON with the same keys
+- Translate ONLY the values, NEVER the keys
+- Preserve medical terminology
+- Do NOT summarize
+- Do NOT explain
+
+JSON:
+{json.dumps(misses, ensure_ascii=False)}
+"""
+
+    try:
+        response = with_retry(
+            client.chat.completions.create,
+            model="llama-3.1-8b-instant",
+            messages=[
+                {"role": "system", "content": "You are a medical translation engine. You output ONLY valid JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.1
+        )
+    except groq.BadRequestError as e:
+        # JSON mode reports unparseable model output as a 400
+        if _error_code(e) == "json_validate_failed":
+            raise ValueError(f"Batch translation returned invalid JSON: {e}") from e
+        raise
+
+    data = json.loads(response.choices[0].message.content)
+    if not isinstance(data, dict):
+        raise ValueError(f"Batch translation returned {type(data).__name__}, not an object")
+
+    missing = [k for k in misses if k not in data]
+    if missing:
+        raise ValueError(f"Batch translation missing keys: {missing}")
+
+    for k, text in misses.items():
+        cached[k] = str(data[k]).strip()
+        _cache_put(text, target_lang, cached[k])
+
+    return {k: cached[k] for k in payload}
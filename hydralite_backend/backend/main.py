@@ -1,78 +1,62 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
-from language_service import translate_text
 
 import os
+import sys
+import queue
 import shutil
 import json
 import uuid
+import hashlib
 import threading
 import time
-from dotenv import load_dotenv
-from pydub import AudioSegment
-from typing import Set, Optional
-from functools import lru_cache
+import multiprocessing
+from typing import Set
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import logging
+import aiofiles
 from pathlib import Path
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+from config import (
+    LOG_FORMAT,
+    ALLOWED_ORIGINS,
+    UPLOAD_DIR,
+    PROCESSED_DIR,
+    TRANSCRIPTS_DIR,
+    SUMMARIES_DIR,
+    PDFS_DIR,
+    BLUETOOTH_DIR,
+    ENABLE_BLUETOOTH_WATCHER,
+    STATUS_FILE,
+    PROCESSED_LOG,
+    STATUS_BACKEND,
+    REDIS_URL,
+    STATUS_REDIS_KEY,
+    STATUS_FLUSH_DELAY,
+    FILE_READY_TIMEOUT,
+    BLUETOOTH_RESCAN_INTERVAL,
+    MAX_FILE_SIZE_MB,
+    UPLOAD_CHUNK_SIZE,
+    MAX_CONCURRENT_PROCESSING,
+)
+from json_utils import dump_json, load_json
 
 # ================= LOGGING SETUP =================
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format=LOG_FORMAT
 )
 logger = logging.getLogger(__name__)
 
-# ================= LOAD ENV =================
-load_dotenv()
-
-# ================= CONFIGURATION =================
-class Config:
-    # FFmpeg paths - use system PATH in production
-    FFMPEG_PATH = os.getenv("FFMPEG_PATH", "ffmpeg")
-    FFPROBE_PATH = os.getenv("FFPROBE_PATH", "ffprobe")
-    
-    # CORS origins - restrict in production
-    ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
-    
-    # Directories
-    BASE_DIR = Path(__file__).parent
-    UPLOAD_DIR = BASE_DIR / "uploads"
-    PROCESSED_DIR = BASE_DIR / "processed"
-    TRANSCRIPTS_DIR = BASE_DIR / "transcripts"
-    SUMMARIES_DIR = BASE_DIR / "summaries"
-    PDFS_DIR = BASE_DIR / "pdfs"
-    
-    # Bluetooth directory - disable in production if not needed
-    BLUETOOTH_DIR = os.getenv("BLUETOOTH_DIR", "")
-    ENABLE_BLUETOOTH_WATCHER = os.getenv("ENABLE_BLUETOOTH_WATCHER", "false").lower() == "true"
-    
-    # Files
-    STATUS_FILE = BASE_DIR / "status.json"
-    PROCESSED_LOG = BASE_DIR / "processed_bluetooth.json"
-    
-    # Cache settings
-    STATUS_CACHE_TTL = int(os.getenv("STATUS_CACHE_TTL", "2"))
-    
-    # File processing
-    FILE_READY_TIMEOUT = int(os.getenv("FILE_READY_TIMEOUT", "20"))
-    MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "100"))
-    
-    # Rate limiting
-    MAX_CONCURRENT_PROCESSING = int(os.getenv("MAX_CONCURRENT_PROCESSING", "3"))
-
-config = Config()
-
-# ================= FFMPEG SETUP =================
-if config.FFMPEG_PATH != "ffmpeg":
-    os.environ["PATH"] += os.pathsep + str(Path(config.FFMPEG_PATH).parent)
-AudioSegment.converter = config.FFMPEG_PATH
-AudioSegment.ffprobe = config.FFPROBE_PATH
-
 # ================= SERVICES =================
-from assembly_service import transcribe_audio
-from groq_service import generate_summary
-from pdf_service import generate_pdf
+# The pipeline (and the services it uses) runs in worker processes
+from pipeline import init_worker, process_task_entry
+from http_pool import SHARED_HTTPX
 
 # ================= APP =================
 app = FastAPI(
@@ -84,7 +68,7 @@ app = FastAPI(
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=config.ALLOWED_ORIGINS,
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -92,28 +76,77 @@ app.add_middleware(
 
 # ================= CREATE DIRECTORIES =================
 for directory in [
-    config.UPLOAD_DIR,
-    config.PROCESSED_DIR,
-    config.TRANSCRIPTS_DIR,
-    config.SUMMARIES_DIR,
-    config.PDFS_DIR
+    UPLOAD_DIR,
+    PROCESSED_DIR,
+    TRANSCRIPTS_DIR,
+    SUMMARIES_DIR,
+    PDFS_DIR
 ]:
     directory.mkdir(parents=True, exist_ok=True)
 
-# ================= PROCESSING SEMAPHORE =================
-PROCESSING_SEMAPHORE = threading.Semaphore(config.MAX_CONCURRENT_PROCESSING)
+# ================= WORKER PROCESSES =================
+# Pipeline workers are started by a fork server (or spawned) rather than
+# forked from the threaded server process
+_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
 
-# ================= CACHED STATUS =================
-_status_cache = {"data": None, "timestamp": 0}
+# ================= STATUS STORE =================
+# Canonical status lives in memory in the API process and is flushed to
+# disk on a short debounce. Pipeline workers forward updates over a queue.
+IDLE_STATUS = {"stage": "idle", "message": "Ready", "progress": 0}
+
+_STATUS = {"data": dict(IDLE_STATUS), "lock": threading.Lock(), "timer": None}
+_STATUS_QUEUE = _MP_CONTEXT.Queue()
+
+# Translation caches live in the workers; DELETE /admin/cache bumps this
+# counter and each worker clears its own cache before translating again
+_CACHE_GENERATION = _MP_CONTEXT.Value("i", 0)
+
+if STATUS_BACKEND == "redis":
+    import redis
+    _redis = redis.Redis.from_url(REDIS_URL)
+else:
+    _redis = None
+
+def _flush_status():
+    """Persist the latest status snapshot"""
+    with _STATUS["lock"]:
+        data = _STATUS["data"]
+        _STATUS["timer"] = None
+    try:
+        # Write aside then rename, so readers never see a half-written file
+        tmp = STATUS_FILE.with_suffix(".tmp")
+        dump_json(data, tmp)
+        os.replace(tmp, STATUS_FILE)
+    except Exception as e:
+        logger.error(f"Failed to write status: {e}")
+
+def _set_status(data: dict):
+    """Update in-memory status and schedule a coalesced disk flush"""
+    with _STATUS["lock"]:
+        _STATUS["data"] = data
+        if _STATUS["timer"] is None:
+            _STATUS["timer"] = threading.Timer(STATUS_FLUSH_DELAY, _flush_status)
+            _STATUS["timer"].daemon = True
+            _STATUS["timer"].start()
+
+def status_listener():
+    """Apply status updates forwarded by pipeline workers"""
+    while True:
+        data = _STATUS_QUEUE.get()
+        if data is None:
+            break
+        _set_status(data)
 
 def write_status(data: dict):
-    """Write status with cache invalidation"""
+    """Publish a status update from the API process"""
     data["timestamp"] = int(time.time())
     try:
-        with open(config.STATUS_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        _status_cache["data"] = data
-        _status_cache["timestamp"] = time.time()
+        if _redis is not None:
+            _redis.set(STATUS_REDIS_KEY, json.dumps(data, ensure_ascii=False))
+        else:
+            _set_status(data)
     except Exception as e:
         logger.error(f"Failed to write status: {e}")
 
@@ -121,32 +154,51 @@ def write_status(data: dict):
 def get_status():
     """Get current processing status"""
     try:
-        if (_status_cache["data"] is not None and 
-            time.time() - _status_cache["timestamp"] < config.STATUS_CACHE_TTL):
-            return _status_cache["data"]
-        
-        if not config.STATUS_FILE.exists():
-            status = {"stage": "idle", "message": "Ready", "progress": 0}
-        else:
-            with open(config.STATUS_FILE, encoding="utf-8") as f:
-                status = json.load(f)
-        
-        _status_cache["data"] = status
-        _status_cache["timestamp"] = time.time()
-        
-        return status
+        if _redis is not None:
+            raw = _redis.get(STATUS_REDIS_KEY)
+            return json.loads(raw) if raw else IDLE_STATUS
+
+        with _STATUS["lock"]:
+            return _STATUS["data"]
     except Exception as e:
         logger.error(f"Error reading status: {e}")
         return {"stage": "error", "message": "Status unavailable", "progress": 0}
 
+# ================= PROCESSING POOL =================
+# ffmpeg + transcription + PDF run in worker processes; the pool size
+# bounds how many recordings are processed at once
+def _new_pipeline_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=MAX_CONCURRENT_PROCESSING,
+        mp_context=_MP_CONTEXT,
+        initializer=init_worker,
+        initargs=(_STATUS_QUEUE, _CACHE_GENERATION)
+    )
+
+PIPELINE_POOL = _new_pipeline_pool()
+_POOL_LOCK = threading.Lock()
+
+def submit_pipeline(*args):
+    """Queue a recording for processing, replacing the pool if a worker died"""
+    global PIPELINE_POOL
+    pool = PIPELINE_POOL
+    try:
+        return pool.submit(process_task_entry, *args)
+    except BrokenProcessPool:
+        with _POOL_LOCK:
+            if PIPELINE_POOL is pool:
+                logger.error("Pipeline pool broken by a dead worker, restarting it")
+                pool.shutdown(wait=False, cancel_futures=True)
+                PIPELINE_POOL = _new_pipeline_pool()
+        return PIPELINE_POOL.submit(process_task_entry, *args)
+
 # ================= PROCESSED LOG =================
 def load_processed() -> Set[str]:
     """Load processed files log"""
     try:
-        if not config.PROCESSED_LOG.exists():
+        if not PROCESSED_LOG.exists():
             return set()
-        with open(config.PROCESSED_LOG, "r", encoding="utf-8") as f:
-            return set(json.load(f))
+        return set(load_json(PROCESSED_LOG))
     except Exception as e:
         logger.error(f"Error loading processed log: {e}")
         return set()
@@ -154,17 +206,13 @@ def load_processed() -> Set[str]:
 def save_processed(processed_set: Set[str]):
     """Save processed files log"""
     try:
-        with open(config.PROCESSED_LOG, "w", encoding="utf-8") as f:
-            json.dump(sorted(list(processed_set)), f, indent=2)
+        dump_json(sorted(processed_set), PROCESSED_LOG)
     except Exception as e:
         logger.error(f"Error saving processed log: {e}")
 
 # ================= FILE READY CHECK =================
-def wait_until_ready(path: Path, timeout: int = None) -> bool:
+def wait_until_ready(path: Path, timeout: int = FILE_READY_TIMEOUT) -> bool:
     """Wait until file is ready for processing"""
-    if timeout is None:
-        timeout = config.FILE_READY_TIMEOUT
-        
     last_size = -1
     start = time.time()
     stable_count = 0
@@ -184,267 +232,141 @@ def wait_until_ready(path: Path, timeout: int = None) -> bool:
         time.sleep(0.5)
     return False
 
-# ================= AUDIO PREPROCESS =================
-def preprocess_audio(input_path: Path, output_wav: Path):
-    """Preprocess audio file"""
-    try:
-        audio = AudioSegment.from_file(str(input_path))
-        if audio.channels != 1 or audio.frame_rate != 16000:
-            audio = audio.set_channels(1).set_frame_rate(16000)
-        audio.export(str(output_wav), format="wav", parameters=["-ac", "1", "-ar", "16000"])
-        del audio
-        logger.info(f"Audio preprocessed: {output_wav.name}")
-    except Exception as e:
-        logger.error(f"Audio preprocessing failed: {e}")
-        raise
+# ================= BLUETOOTH WATCHER =================
+# inotify reports when the writer closes a file, which is the ready signal,
+# and (with full events) a file renamed in from elsewhere as a move.
+# Other platforms only report creation, so fall back to size polling there,
+# with a slow periodic rescan for files that were not ready in time.
+CLOSE_EVENTS = sys.platform.startswith("linux")
 
-# ================= ROLE-BASED FORMATTER =================
-def format_role_based_text(utterances):
-    """Format transcript with speaker roles"""
-    if not utterances:
-        return ""
-
-    speaker_lengths = {}
-    for u in utterances:
-        speaker_lengths[u["speaker"]] = speaker_lengths.get(u["speaker"], 0) + len(u["text"])
-
-    doctor_speaker = max(speaker_lengths, key=speaker_lengths.get) if speaker_lengths else None
-
-    lines = [
-        f"{'Doctor' if u['speaker'] == doctor_speaker else 'Patient'}: {u['text']}"
-        for u in utterances
-    ]
-
-    return "\n".join(lines)
-
-@lru_cache(maxsize=128)
-def detect_language_from_text(text: str) -> str:
-    """Detect language from text (cached)"""
-    for ch in text[:500]:
-        if "\u0900" <= ch <= "\u097F":
-            return "hi"
-    return "en"
-
-# ================= CORE PIPELINE =================
-def process_audio_pipeline(wav_path: Path, base_name: str, source: str) -> bool:
-    """Main audio processing pipeline"""
-    if not PROCESSING_SEMAPHORE.acquire(blocking=False):
-        logger.warning(f"Max concurrent processing reached, queuing: {base_name}")
-        PROCESSING_SEMAPHORE.acquire()  # Wait for slot
-    
-    try:
-        logger.info(f"Starting pipeline for: {base_name} (source: {source})")
-        
-        # TRANSCRIPTION
-        write_status({
-            "source": source,
-            "file": base_name,
-            "stage": "transcribing",
-            "message": "Transcribing audio...",
-            "progress": 20
-        })
-
-        transcript = None
-        for attempt in range(2):
-            try:
-                transcript = transcribe_audio(str(wav_path))
-                if transcript and getattr(transcript, "text", None):
-                    break
-            except Exception as e:
-                logger.warning(f"Transcription attempt {attempt + 1} failed: {e}")
-                if attempt < 1:
-                    time.sleep(2)
-
-        if not transcript or not transcript.text or not transcript.text.strip():
-            raise RuntimeError("Transcription failed or empty")
-
-        language = detect_language_from_text(transcript.text)
-        logger.info(f"Detected language: {language}")
-
-        write_status({
-            "source": source,
-            "file": base_name,
-            "stage": "transcribing",
-            "message": "Processing transcript...",
-            "progress": 40
-        })
-
-        utterances = [
-            {
-                "speaker": u.speaker,
-                "text": u.text,
-                "start_ms": u.start,
-                "end_ms": u.end
-            }
-            for u in (getattr(transcript, "utterances", None) or [])
-        ]
-
-        role_based_text = format_role_based_text(utterances)
-
-        transcript_json = {
-            "audio_file": base_name,
-            "language": language,
-            "full_text": role_based_text,
-            "utterances": utterances
-        }
-
-        tpath = config.TRANSCRIPTS_DIR / f"{base_name}.json"
-        with open(tpath, "w", encoding="utf-8") as f:
-            json.dump(transcript_json, f, indent=2, ensure_ascii=False)
-
-        # SUMMARY
-        write_status({
-            "source": source,
-            "file": base_name,
-            "language": language,
-            "stage": "summarizing",
-            "message": "Generating summary...",
-            "progress": 60
-        })
-
-        summary_en = generate_summary(transcript_json)
-        if not summary_en:
-            raise RuntimeError("Summary generation failed")
-
-        write_status({
-            "source": source,
-            "file": base_name,
-            "language": language,
-            "stage": "summarizing",
-            "message": "Translating summary..." if language != "en" else "Finalizing summary...",
-            "progress": 75
-        })
-
-        if language != "en":
-            summary_final = {
-                k: [translate_text(i, language) for i in v]
-                if isinstance(v, list)
-                else translate_text(v, language)
-                for k, v in summary_en.items()
-            }
-        else:
-            summary_final = summary_en
-
-        spath = config.SUMMARIES_DIR / f"{base_name}_summary.json"
-        with open(spath, "w", encoding="utf-8") as f:
-            json.dump(summary_final, f, indent=2, ensure_ascii=False)
-
-        # PDF
-        write_status({
-            "source": source,
-            "file": base_name,
-            "language": language,
-            "stage": "generating_pdf",
-            "message": "Creating PDF report...",
-            "progress": 90
-        })
-
-        generate_pdf(str(spath), language=language)
-
-        write_status({
-            "source": source,
-            "file": base_name,
-            "language": language,
-            "stage": "completed",
-            "message": "Processing complete!",
-            "progress": 100
-        })
-
-        logger.info(f"Pipeline completed: {base_name}")
-        return True
+if CLOSE_EVENTS:
+    from watchdog.observers.inotify import InotifyObserver
 
-    except Exception as e:
-        logger.error(f"Pipeline error for {base_name}: {e}", exc_info=True)
-        write_status({
-            "source": source,
-            "file": base_name,
-            "stage": "error",
-            "message": f"Error: {str(e)}",
-            "error": str(e),
-            "progress": 0
-        })
-        return False
-    finally:
-        PROCESSING_SEMAPHORE.release()
+class BluetoothEventHandler(FileSystemEventHandler):
+    """Queue (path, needs_ready_check) for files landing in the Bluetooth dir"""
 
-# ================= BLUETOOTH WATCHER =================
-def bluetooth_watcher():
-    """Watch Bluetooth directory for new files"""
-    logger.info("Bluetooth watcher started")
-    processed = load_processed()
-    last_check = 0
+    def __init__(self, directory: Path, events: queue.Queue):
+        self.directory = directory
+        self.events = events
 
-    while True:
-        try:
-            if time.time() - last_check < 3:
-                time.sleep(0.5)
-                continue
-            
-            last_check = time.time()
+    def _queue(self, path: str, needs_ready_check: bool):
+        file_path = Path(path)
+        if file_path.parent == self.directory:
+            self.events.put((file_path, needs_ready_check))
 
-            bluetooth_path = Path(config.BLUETOOTH_DIR)
-            if not bluetooth_path.exists():
-                time.sleep(5)
-                continue
+    def on_closed(self, event):
+        if not event.is_directory:
+            self._queue(event.src_path, False)
 
-            for file_path in bluetooth_path.iterdir():
-                if not file_path.is_file():
-                    continue
-                    
-                if file_path.name in processed:
-                    continue
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._queue(event.dest_path, not CLOSE_EVENTS)
+
+    def on_created(self, event):
+        if not CLOSE_EVENTS and not event.is_directory:
+            self._queue(event.src_path, True)
+
+def process_bluetooth_file(file_path: Path, needs_ready_check: bool, processed: Set[str]):
+    """Move a received Bluetooth file into uploads and run the pipeline"""
+    if not file_path.is_file() or file_path.name in processed:
+        return
+
+    if not file_path.suffix.lower() in [".wav", ".mp3", ".m4a", ".aac", ".ogg", ".3gp"]:
+        return
+
+    try:
+        if file_path.stat().st_size == 0:
+            return
+    except OSError:
+        return
 
-                if not file_path.suffix.lower() in [".wav", ".mp3", ".m4a", ".aac", ".ogg", ".3gp"]:
-                    continue
+    if needs_ready_check and not wait_until_ready(file_path):
+        # Left in place; a later event or rescan retries it
+        logger.warning(f"File not ready, will retry: {file_path.name}")
+        return
 
-                try:
-                    if file_path.stat().st_size == 0:
-                        continue
-                except:
-                    continue
+    uid = uuid.uuid4().hex[:8]
+    new_name = f"{uid}_{file_path.name}"
+    upload_path = UPLOAD_DIR / new_name
 
-                if not wait_until_ready(file_path):
-                    logger.warning(f"File not ready: {file_path.name}")
-                    continue
+    shutil.move(str(file_path), str(upload_path))
+    logger.info(f"Moved from Bluetooth: {new_name}")
 
-                uid = uuid.uuid4().hex[:8]
-                new_name = f"{uid}_{file_path.name}"
-                upload_path = config.UPLOAD_DIR / new_name
+    base = upload_path.stem
+    wav_path = PROCESSED_DIR / f"{base}.wav"
 
-                shutil.move(str(file_path), str(upload_path))
-                logger.info(f"Moved from Bluetooth: {new_name}")
+    future = submit_pipeline(upload_path, wav_path, base, "bluetooth")
+    if future.result():
+        processed.add(file_path.name)
+        save_processed(processed)
 
-                base = upload_path.stem
-                wav_path = config.PROCESSED_DIR / f"{base}.wav"
+def bluetooth_watcher():
+    """Watch Bluetooth directory for new files"""
+    bluetooth_path = Path(BLUETOOTH_DIR).resolve()
+    while not bluetooth_path.exists():
+        time.sleep(5)
 
-                preprocess_audio(upload_path, wav_path)
+    logger.info("Bluetooth watcher started")
+    processed = load_processed()
+    events = queue.Queue()
 
-                if process_audio_pipeline(wav_path, base, "bluetooth"):
-                    processed.add(file_path.name)
-                    save_processed(processed)
+    # Full events: a file moved in from another directory is reported as a
+    # move (not a creation), so it needs no ready check
+    observer = InotifyObserver(generate_full_events=True) if CLOSE_EVENTS else Observer()
+    observer.schedule(BluetoothEventHandler(bluetooth_path, events), str(bluetooth_path))
+    observer.daemon = True
+    observer.start()
+
+    # Files that arrived while the watcher was not running
+    for file_path in bluetooth_path.iterdir():
+        events.put((file_path, True))
+    last_scan = time.monotonic()
+
+    while True:
+        # Without close events, rescan for files whose ready check timed out
+        if not CLOSE_EVENTS and time.monotonic() - last_scan >= BLUETOOTH_RESCAN_INTERVAL:
+            for file_path in bluetooth_path.iterdir():
+                events.put((file_path, True))
+            last_scan = time.monotonic()
 
+        try:
+            file_path, needs_ready_check = events.get(timeout=BLUETOOTH_RESCAN_INTERVAL)
+        except queue.Empty:
+            continue
+
+        try:
+            process_bluetooth_file(file_path, needs_ready_check, processed)
         except Exception as e:
             logger.error(f"Bluetooth watcher error: {e}", exc_info=True)
 
-        time.sleep(3)
-
 # ================= WEB UPLOAD =================
+# Fingerprints of uploads still in the pipeline -> their future, so a repeat
+# upload (double click, client retry) does not process the same files twice
+_IN_FLIGHT = {}
+_IN_FLIGHT_LOCK = threading.Lock()
+
+def _upload_done(base: str, future):
+    """Pipeline done callback: forget the in-flight fingerprint"""
+    with _IN_FLIGHT_LOCK:
+        if _IN_FLIGHT.get(base) is future:
+            del _IN_FLIGHT[base]
+
 @app.post("/upload-audio")
 async def upload_audio(
-    file: UploadFile = File(...),
-    background_tasks: BackgroundTasks = BackgroundTasks()
+    file: UploadFile = File(...)
 ):
     """Upload audio file for processing"""
+    tmp = None
     try:
         # Check file size
         file.file.seek(0, 2)
         size_mb = file.file.tell() / (1024 * 1024)
         file.file.seek(0)
         
-        if size_mb > config.MAX_FILE_SIZE_MB:
+        if size_mb > MAX_FILE_SIZE_MB:
             raise HTTPException(
                 status_code=413,
-                detail=f"File too large. Max size: {config.MAX_FILE_SIZE_MB}MB"
+                detail=f"File too large. Max size: {MAX_FILE_SIZE_MB}MB"
             )
         
         # Validate file extension
@@ -455,26 +377,49 @@ async def upload_audio(
                 detail="Invalid file format. Supported: wav, mp3, m4a, aac, ogg, 3gp"
             )
         
-        uid = uuid.uuid4().hex[:8]
-        safe_filename = "".join(c for c in file.filename if c.isalnum() or c in "._- ")
-        name = f"{uid}_{safe_filename}"
-        raw = config.UPLOAD_DIR / name
-
-        with open(raw, "wb") as f:
-            while chunk := await file.read(8192):
-                f.write(chunk)
-
-        base = raw.stem
-        wav = config.PROCESSED_DIR / f"{base}.wav"
-
-        def process_task():
-            try:
-                preprocess_audio(raw, wav)
-                process_audio_pipeline(wav, base, "web")
-            except Exception as e:
-                logger.error(f"Background processing failed: {e}", exc_info=True)
-
-        background_tasks.add_task(process_task)
+        # Stream to disk and fingerprint in the same pass; aiofiles keeps
+        # disk writes off the event loop thread
+        hasher = hashlib.sha256()
+        tmp = UPLOAD_DIR / f"{uuid.uuid4().hex[:8]}.part"
+
+        async with aiofiles.open(tmp, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                hasher.update(chunk)
+                await f.write(chunk)
+
+        # Identical recordings map to the same base name
+        base = hasher.hexdigest()[:16]
+        name = f"{base}{ext}"
+
+        with _IN_FLIGHT_LOCK:
+            processing = base in _IN_FLIGHT
+        if processing:
+            logger.info(f"Duplicate upload, already processing: {base}")
+            return {"status": "processing", "audio_name": base}
+
+        summary_path = SUMMARIES_DIR / f"{base}_summary.json"
+        pdf_path = PDFS_DIR / f"{base}_summary.pdf"
+        if summary_path.exists() and pdf_path.exists():
+            write_status({
+                "source": "web",
+                "file": base,
+                "stage": "completed",
+                "message": "Already processed",
+                "progress": 100
+            })
+            logger.info(f"Duplicate upload, reusing results: {base}")
+            return {"status": "completed", "audio_name": base, "cached": True}
+
+        raw = UPLOAD_DIR / name
+        tmp.replace(raw)
+        wav = PROCESSED_DIR / f"{base}.wav"
+
+        # No await between the in-flight check above and registering here,
+        # so concurrent uploads on the event loop cannot both get through
+        future = submit_pipeline(raw, wav, base, "web")
+        with _IN_FLIGHT_LOCK:
+            _IN_FLIGHT[base] = future
+        future.add_done_callback(partial(_upload_done, base))
         
         logger.info(f"Upload received: {name}")
         return {"status": "processing", "audio_name": base}
@@ -484,6 +429,10 @@ async def upload_audio(
     except Exception as e:
         logger.error(f"Upload error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Upload failed")
+    finally:
+        # Renamed into place on success; anything left is a partial upload
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
 
 # ================= PDF DOWNLOAD =================
 @app.get("/download-pdf/{audio_name}")
@@ -491,7 +440,7 @@ def download_pdf(audio_name: str):
     """Download generated PDF report"""
     # Sanitize filename
     safe_name = "".join(c for c in audio_name if c.isalnum() or c in "_-")
-    path = config.PDFS_DIR / f"{safe_name}_summary.pdf"
+    path = PDFS_DIR / f"{safe_name}_summary.pdf"
     
     if not path.exists():
         raise HTTPException(status_code=404, detail="PDF not found")
@@ -502,14 +451,26 @@ def download_pdf(audio_name: str):
         filename=f"summary_{safe_name}.pdf"
     )
 
+# ================= ADMIN =================
+@app.delete("/admin/cache")
+def clear_cache():
+    """Clear the translation cache in every pipeline worker"""
+    # Workers pick the new generation up before their next translation
+    with _CACHE_GENERATION.get_lock():
+        _CACHE_GENERATION.value += 1
+        generation = _CACHE_GENERATION.value
+    logger.info(f"Translation cache clear requested (generation {generation})")
+    return {"status": "cleared", "generation": generation}
+
 # ================= STARTUP =================
 @app.on_event("startup")
 def on_startup():
     """Initialize application on startup"""
-    write_status({"stage": "idle", "message": "Ready", "progress": 0})
+    write_status(dict(IDLE_STATUS))
+    threading.Thread(target=status_listener, daemon=True).start()
     logger.info("Application started")
     
-    if config.ENABLE_BLUETOOTH_WATCHER and config.BLUETOOTH_DIR:
+    if ENABLE_BLUETOOTH_WATCHER and BLUETOOTH_DIR:
         logger.info("Starting Bluetooth watcher")
         threading.Thread(target=bluetooth_watcher, daemon=True).start()
     else:
@@ -520,6 +481,10 @@ def on_startup():
 def on_shutdown():
     """Cleanup on shutdown"""
     logger.info("Application shutting down")
+    PIPELINE_POOL.shutdown(wait=False, cancel_futures=True)
+    _STATUS_QUEUE.put(None)
+    _flush_status()
+    SHARED_HTTPX.close()
 
 # ================= HEALTH CHECK =================
 @app.get("/health")
@@ -528,7 +493,7 @@ def health_check():
     return {
         "status": "ok",
         "version": "1.0.0",
-        "bluetooth_watcher": config.ENABLE_BLUETOOTH_WATCHER
+        "bluetooth_watcher": ENABLE_BLUETOOTH_WATCHER
     }
 
 # ================= ROOT =================
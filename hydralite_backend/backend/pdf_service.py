@@ -1,168 +1,34 @@
-# import json
-# import os
-# from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-# from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-# from reportlab.lib.pagesizes import A4
-# from reportlab.pdfbase import pdfmetrics
-# from reportlab.pdfbase.ttfonts import TTFont
-
-# # ===============================
-# # BASE PATHS
-# # ===============================
-# BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-# PDF_DIR = os.path.join(BASE_DIR, "pdfs")
-# FONTS_DIR = os.path.join(BASE_DIR, "fonts")
-
-# os.makedirs(PDF_DIR, exist_ok=True)
-
-# # ===============================
-# # FONT MAP (LANGUAGE → FONT FILE)
-# # ===============================
-# FONT_MAP = {
-#     "hi": "NotoSansDevanagari-Regular.ttf",
-#     "mr": "NotoSansDevanagari-Regular.ttf",
-#     "gu": "NotoSansGujarati-Regular.ttf",
-#     "ta": "NotoSansTamil-Regular.ttf",
-#     "te": "NotoSansTelugu-Regular.ttf",
-#     "kn": "NotoSansKannada-Regular.ttf",
-#     "ml": "NotoSansMalayalam-Regular.ttf",
-#     "bn": "NotoSansBengali-Regular.ttf",
-# }
-
-# # ===============================
-# # FONT REGISTRATION (SAFE)
-# # ===============================
-# def register_font(language: str) -> str:
-#     """
-#     Returns a ReportLab-safe font name.
-#     English uses Helvetica (built-in).
-#     Indian languages use proper Noto Sans Unicode fonts.
-#     """
-
-#     # ✅ English → built-in font
-#     if language == "en":
-#         return "Helvetica"
-
-#     font_file = FONT_MAP.get(language)
-
-#     if not font_file:
-#         print("⚠ No font mapping found, falling back to Helvetica")
-#         return "Helvetica"
-
-#     font_path = os.path.join(FONTS_DIR, font_file)
-#     font_name = font_file.replace(".ttf", "")
-
-#     try:
-#         if font_name not in pdfmetrics.getRegisteredFontNames():
-#             pdfmetrics.registerFont(TTFont(font_name, font_path))
-#         return font_name
-#     except Exception as e:
-#         print("⚠ Font registration failed, fallback to Helvetica:", e)
-#         return "Helvetica"
-
-# # ===============================
-# # PDF GENERATOR
-# # ===============================
-# def generate_pdf(summary_json_path: str, language: str = "en") -> str:
-#     # -------- LOAD SUMMARY JSON --------
-#     with open(summary_json_path, "r", encoding="utf-8") as f:
-#         summary = json.load(f)
-
-#     base_name = os.path.splitext(os.path.basename(summary_json_path))[0]
-#     pdf_path = os.path.join(PDF_DIR, f"{base_name}.pdf")
-
-#     # -------- REGISTER FONT --------
-#     font_name = register_font(language)
-
-#     # -------- PDF DOCUMENT --------
-#     doc = SimpleDocTemplate(
-#         pdf_path,
-#         pagesize=A4,
-#         rightMargin=40,
-#         leftMargin=40,
-#         topMargin=40,
-#         bottomMargin=40,
-#     )
-
-#     base_styles = getSampleStyleSheet()
-
-#     styles = {
-#         "heading": ParagraphStyle(
-#             "heading",
-#             parent=base_styles["Heading3"],
-#             fontName=font_name,
-#             spaceAfter=8,
-#         ),
-#         "normal": ParagraphStyle(
-#             "normal",
-#             parent=base_styles["Normal"],
-#             fontName=font_name,
-#             spaceAfter=4,
-#         ),
-#     }
-
-#     story = []
-
-#     # -------- SAFE PARAGRAPH HELPER --------
-#     def safe_para(text):
-#         """
-#         Ensures text is safe for ReportLab Paragraph
-#         """
-#         if not text:
-#             return "—"
-#         return str(text).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-
-#     # -------- SECTION HELPER --------
-#     def add_section(title, content):
-#         story.append(Paragraph(f"<b>{safe_para(title)}</b>", styles["heading"]))
-#         story.append(Spacer(1, 6))
-
-#         if isinstance(content, list):
-#             if not content:
-#                 story.append(Paragraph("—", styles["normal"]))
-#             else:
-#                 for item in content:
-#                     story.append(
-#                         Paragraph(f"• {safe_para(item)}", styles["normal"])
-#                     )
-#         else:
-#             story.append(Paragraph(safe_para(content), styles["normal"]))
-
-#         story.append(Spacer(1, 14))
-
-#     # -------- PDF CONTENT --------
-#     add_section("Doctor Summary", summary.get("doctor_summary", ""))
-#     add_section("Symptoms", summary.get("symptoms", []))
-#     add_section("Patient History", summary.get("patient_history", []))
-#     add_section("Risk Factors", summary.get("risk_factors", []))
-#     add_section("Prescription", summary.get("prescription", []))
-#     add_section("Advice", summary.get("advice", []))
-#     add_section("Recommended Action", summary.get("recommended_action", ""))
-
-#     # -------- BUILD PDF --------
-#     doc.build(story)
-
-#     return pdf_path
-
-
-import json
+import io
+import mmap
 import os
-from datetime import datetime
+import multiprocessing
+from datetime import date
+from functools import lru_cache, partial
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
 
 from reportlab.platypus import (
-    SimpleDocTemplate,
+    BaseDocTemplate,
+    PageTemplate,
+    Frame,
     Paragraph,
     Spacer,
-    Table,
-    TableStyle,
     KeepTogether
 )
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus.flowables import HRFlowable
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
+try:
+    import orjson as _json  # C decoder, optional
+    _JSON_ACCEPTS_BUFFER = True
+except ImportError:
+    import json as _json
+    _JSON_ACCEPTS_BUFFER = False
+
 # ===============================
 # BASE PATHS
 # ===============================
@@ -170,7 +36,28 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PDF_DIR = os.path.join(BASE_DIR, "pdfs")
 FONTS_DIR = os.path.join(BASE_DIR, "fonts")
 
-os.makedirs(PDF_DIR, exist_ok=True)
+# Created on first use rather than at import
+_PDF_DIR_READY = False
+
+def _ensure_pdf_dir():
+    global _PDF_DIR_READY
+    if not _PDF_DIR_READY:
+        os.makedirs(PDF_DIR, exist_ok=True)
+        _PDF_DIR_READY = True
+
+# ===============================
+# PAGE LAYOUT
+# ===============================
+# A4 with 40pt margins. Frames track layout position during a build, so
+# each document gets its own; sharing one breaks concurrent renders.
+_FRAME_BOX = (40, 40, A4[0] - 80, A4[1] - 80)
+
+def _page_template() -> PageTemplate:
+    return PageTemplate(
+        id="main",
+        frames=[Frame(*_FRAME_BOX, id="normal")],
+        pagesize=A4,
+    )
 
 # ===============================
 # FAKE DOCTOR DETAILS (LETTERHEAD)
@@ -201,20 +88,29 @@ FONT_MAP = {
 # ===============================
 # FONT REGISTRATION
 # ===============================
+# Resolved once at import: language -> (font name, font file path)
+_FONT_PATHS = {
+    lang: (font_file.replace(".ttf", ""), os.path.join(FONTS_DIR, font_file))
+    for lang, font_file in FONT_MAP.items()
+}
+
+_REGISTERED = set()
+
 def register_font(language: str) -> str:
     if language == "en":
         return "Helvetica"
 
-    font_file = FONT_MAP.get(language)
-    if not font_file:
+    font = _FONT_PATHS.get(language)
+    if not font:
         return "Helvetica"
 
-    font_path = os.path.join(FONTS_DIR, font_file)
-    font_name = font_file.replace(".ttf", "")
+    font_name, font_path = font
+    if font_name in _REGISTERED:
+        return font_name
 
     try:
-        if font_name not in pdfmetrics.getRegisteredFontNames():
-            pdfmetrics.registerFont(TTFont(font_name, font_path))
+        pdfmetrics.registerFont(TTFont(font_name, font_path))
+        _REGISTERED.add(font_name)
         return font_name
     except Exception:
         return "Helvetica"
@@ -222,21 +118,119 @@ def register_font(language: str) -> str:
 # ===============================
 # SAFE TEXT
 # ===============================
+# One-pass escape table for ReportLab's mini-markup
+_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
 def safe_text(text):
     if not text:
         return "—"
-    return (
-        str(text)
-        .replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
+    s = str(text)
+    # Most fields are clean: `in` is a C-level scan, skip the copy
+    if "&" not in s and "<" not in s and ">" not in s:
+        return s
+    return s.translate(_ESCAPE_TABLE)
+
+# ===============================
+# SUMMARY LOADING (CACHED)
+# ===============================
+def _freeze(summary):
+    # Top level only: sections become tuples, nested values are left as
+    # parsed so str() of a nested list/dict item prints exactly as before
+    if not isinstance(summary, dict):
+        return summary
+    return MappingProxyType({
+        k: tuple(v) if isinstance(v, list) else v
+        for k, v in summary.items()
+    })
+
+_MMAP_THRESHOLD = 64 * 1024
+
+def _load_json(path: str, size: int = 0):
+    # Bytes in, no text-mode decode; both orjson and json accept bytes
+    with open(path, "rb") as f:
+        if size > _MMAP_THRESHOLD and _JSON_ACCEPTS_BUFFER:
+            # Large files: let orjson parse the mapped pages directly
+            # instead of copying them into a bytes object first
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as buf:
+                    return _json.loads(buf)
+        return _json.loads(f.read())
+
+@lru_cache(maxsize=128)
+def _load_summary_cached(path: str, mtime_ns: int, size: int):
+    # mtime/size are part of the key so a rewritten file is re-parsed;
+    # the mapping is read-only since it is shared between callers
+    return _freeze(_load_json(path, size))
+
+def load_summary(path: str):
+    st = os.stat(path)
+    return _load_summary_cached(path, st.st_mtime_ns, st.st_size)
+
+# ===============================
+# PARAGRAPH STYLES (CACHED PER FONT)
+# ===============================
+_STYLE_CACHE = {}
+
+def _get_styles(font_name: str) -> dict:
+    styles = _STYLE_CACHE.get(font_name)
+    if styles is not None:
+        return styles
+
+    # Bare styles, no sample stylesheet: "Normal" matches ParagraphStyle
+    # defaults, and "Heading3" only adds the leading/spacing set here
+    styles = {
+        "heading": ParagraphStyle(
+            "heading",
+            fontName=font_name,
+            fontSize=11,
+            leading=14,
+            textColor=colors.HexColor("#2F80ED"),
+            spaceBefore=12,
+            spaceAfter=6,
+        ),
+        "normal": ParagraphStyle(
+            "normal",
+            fontName=font_name,
+            spaceAfter=4,
+        ),
+        "rx": ParagraphStyle(
+            "rx",
+            fontName=font_name,
+            leftIndent=18,
+            spaceAfter=6,
+        ),
+    }
+
+    # Shared by every line of the signature block
+    styles["right_small"] = ParagraphStyle(
+        "right_small",
+        fontName=font_name,
+        fontSize=10,
+        alignment=2,
     )
 
+    _STYLE_CACHE[font_name] = styles
+    return styles
+
+# ===============================
+# DATE
+# ===============================
+@lru_cache(maxsize=4)
+def _today_str(ordinal: int) -> str:
+    # Formatted once per day instead of once per PDF
+    return date.fromordinal(ordinal).strftime("%d %b %Y")
+
 # ===============================
 # LETTERHEAD
 # ===============================
-def add_letterhead(story, font_name):
-    styles = getSampleStyleSheet()
+_LETTERHEAD_CACHE: dict[str, tuple] = {}
+
+def _letterhead_lines(font_name: str) -> tuple:
+    # (text, style) pairs; DOCTOR_INFO is constant, so these are built once
+    # per font. Paragraphs themselves are consumed by build, so not cached.
+    lines = _LETTERHEAD_CACHE.get(font_name)
+    if lines is not None:
+        return lines
 
     title = ParagraphStyle(
         "title",
@@ -253,157 +247,145 @@ def add_letterhead(story, font_name):
         alignment=1,
     )
 
-    story.append(Paragraph(f"<b>{DOCTOR_INFO['name']}</b>", title))
-    story.append(Paragraph(DOCTOR_INFO["degree"], sub))
-    story.append(Paragraph(DOCTOR_INFO["clinic"], sub))
-    story.append(
-        Paragraph(
-            f"Reg No: {DOCTOR_INFO['reg_no']} | {DOCTOR_INFO['phone']} | {DOCTOR_INFO['address']}",
-            sub,
-        )
+    lines = (
+        (f"<b>{DOCTOR_INFO['name']}</b>", title),
+        (DOCTOR_INFO["degree"], sub),
+        (DOCTOR_INFO["clinic"], sub),
+        (f"Reg No: {DOCTOR_INFO['reg_no']} | {DOCTOR_INFO['phone']} | {DOCTOR_INFO['address']}", sub),
     )
 
+    _LETTERHEAD_CACHE[font_name] = lines
+    return lines
+
+def add_letterhead(story, font_name):
+    story.extend(Paragraph(text, style) for text, style in _letterhead_lines(font_name))
+
     story.append(Spacer(1, 10))
 
+    # Plain rule; a one-cell Table needs a full layout pass just for a line
     story.append(
-        Table(
-            [[""]],
-            colWidths=[480],
-            style=[
-                ("LINEBELOW", (0, 0), (-1, -1), 2, colors.HexColor("#2F80ED"))
-            ],
+        HRFlowable(
+            width=480,
+            thickness=2,
+            color=colors.HexColor("#2F80ED"),
+            spaceBefore=0,
+            spaceAfter=0,
         )
     )
 
+# ===============================
+# SECTION TITLES
+# ===============================
+# Summary key -> escaped, bold-wrapped heading markup, built once at import
+_SECTION_TITLES = {
+    key: f"<b>{safe_text(title)}</b>"
+    for key, title in (
+        ("doctor_summary", "Doctor Summary"),
+        ("symptoms", "Symptoms"),
+        ("patient_history", "Patient History"),
+        ("risk_factors", "Risk Factors"),
+        ("prescription", "Prescription"),
+        ("advice", "Advice"),
+        ("recommended_action", "Recommended Action"),
+    )
+}
 
 # ===============================
 # PDF GENERATOR
 # ===============================
-def generate_pdf(summary_json_path: str, language: str = "en") -> str:
-    with open(summary_json_path, "r", encoding="utf-8") as f:
-        summary = json.load(f)
+def generate_pdf(summary_json_path: str, language: str = "en", base_name: str | None = None) -> str:
+    summary = load_summary(summary_json_path)
 
-    base_name = os.path.splitext(os.path.basename(summary_json_path))[0]
+    if base_name is None:
+        # Same result as splitext(basename(...)) without the extra calls
+        stem = summary_json_path.rpartition(os.sep)[2]
+        base_name = stem.rpartition(".")[0] or stem
     pdf_path = os.path.join(PDF_DIR, f"{base_name}.pdf")
 
     font_name = register_font(language)
 
-    doc = SimpleDocTemplate(
-        pdf_path,
+    # Render in memory, then write the file in one go
+    buf = io.BytesIO()
+    doc = BaseDocTemplate(
+        buf,
         pagesize=A4,
         rightMargin=40,
         leftMargin=40,
         topMargin=40,
         bottomMargin=40,
+        pageTemplates=[_page_template()],
     )
 
-    base_styles = getSampleStyleSheet()
-
-    styles = {
-        "heading": ParagraphStyle(
-            "heading",
-            parent=base_styles["Heading3"],
-            fontName=font_name,
-            fontSize=11,
-            textColor=colors.HexColor("#2F80ED"),
-            spaceBefore=12,
-            spaceAfter=6,
-        ),
-        "normal": ParagraphStyle(
-            "normal",
-            parent=base_styles["Normal"],
-            fontName=font_name,
-            spaceAfter=4,
-        ),
-        "rx": ParagraphStyle(
-            "rx",
-            parent=base_styles["Normal"],
-            fontName=font_name,
-            leftIndent=18,
-            spaceAfter=6,
-        ),
-    }
+    styles = _get_styles(font_name)
 
     story = []
 
     # Letterhead
     add_letterhead(story, font_name)
 
-    def add_section(title, content, rx=False):
-        story.append(Paragraph(f"<b>{safe_text(title)}</b>", styles["heading"]))
-        story.append(Spacer(1, 4))
+    # Names used per bullet are bound as defaults so the loop below reads
+    # them as plain locals rather than globals or closure cells
+    def add_section(key, empty, rx=False,
+                    _story=story, _styles=styles, _summary=summary,
+                    _Para=Paragraph, _Spacer=Spacer, _safe=safe_text):
+        content = _summary.get(key, empty)
+        # Collected locally so the story grows once per section
+        items = [_Para(_SECTION_TITLES[key], _styles["heading"]), _Spacer(1, 4)]
 
-        if isinstance(content, list):
+        if isinstance(content, (list, tuple)):
             if not content:
-                story.append(Paragraph("—", styles["normal"]))
+                items.append(_Para("—", _styles["normal"]))
             else:
+                style = _styles["rx"] if rx else _styles["normal"]
+                prefix = "• " if rx else ""
+                # Plain loop: a generator (or pre-3.12 comprehension) would
+                # turn these locals back into closure cells
+                append = items.append
                 for item in content:
-                    style = styles["rx"] if rx else styles["normal"]
-                    prefix = "• " if rx else ""
-                    story.append(
-                        Paragraph(prefix + safe_text(item), style)
-                    )
+                    append(_Para(prefix + _safe(item), style))
         else:
-            story.append(Paragraph(safe_text(content), styles["normal"]))
-        story.append(Spacer(1, 14))
+            items.append(_Para(_safe(content), _styles["normal"]))
+
+        items.append(_Spacer(1, 14))
+        _story.extend(items)
 
     # CONTENT
-    add_section("Doctor Summary", summary.get("doctor_summary", ""))
-    add_section("Symptoms", summary.get("symptoms", []))
-    add_section("Patient History", summary.get("patient_history", []))
-    add_section("Risk Factors", summary.get("risk_factors", []))
-    add_section("Prescription", summary.get("prescription", []), rx=True)
-    add_section("Advice", summary.get("advice", []))
-    add_section("Recommended Action", summary.get("recommended_action", ""))
+    add_section("doctor_summary", "")
+    add_section("symptoms", ())
+    add_section("patient_history", ())
+    add_section("risk_factors", ())
+    add_section("prescription", (), rx=True)
+    add_section("advice", ())
+    add_section("recommended_action", "")
 
     # FOOTER
     signature_block = KeepTogether([
     Spacer(1, 30),
 
     Paragraph(
-        f"Date: {datetime.now().strftime('%d %b %Y')}",
-        ParagraphStyle(
-            "date",
-            fontName=font_name,
-            fontSize=10,
-            alignment=2,
-        ),
+        f"Date: {_today_str(date.today().toordinal())}",
+        styles["right_small"],
     ),
 
     Spacer(1, 18),
 
     Paragraph(
         "Signature:",
-        ParagraphStyle(
-            "sign_label",
-            fontName=font_name,
-            fontSize=10,
-            alignment=2,
-        ),
+        styles["right_small"],
     ),
 
     Spacer(1, 22),  # space for actual handwritten sign
 
     Paragraph(
         "______________________________",
-        ParagraphStyle(
-            "sign_line",
-            fontName=font_name,
-            fontSize=10,
-            alignment=2,
-        ),
+        styles["right_small"],
     ),
 
     Spacer(1, 6),
 
     Paragraph(
         f"<b>{DOCTOR_INFO['name']}</b>",
-        ParagraphStyle(
-            "sign_name",
-            fontName=font_name,
-            fontSize=10,
-            alignment=2,
-        ),
+        styles["right_small"],
     ),
 ])
 
@@ -412,4 +394,33 @@ def generate_pdf(summary_json_path: str, language: str = "en") -> str:
 
 
     doc.build(story)
-    return pdf_path
\ No newline at end of file
+    _ensure_pdf_dir()
+    with open(pdf_path, "wb") as f:
+        f.write(buf.getbuffer())
+    return pdf_path
+
+# ===============================
+# BULK PDF GENERATION
+# ===============================
+def _init_pdf_worker(language: str):
+    # Pre-warm each worker once: output dir + font registration
+    _ensure_pdf_dir()
+    register_font(language)
+
+def generate_pdfs_bulk(paths: list[str], language: str = "en", workers: int | None = None) -> list[str]:
+    """
+    Render many summaries in parallel worker processes.
+    ReportLab rendering is CPU-bound and shares no state between PDFs.
+    Returns PDF paths in the same order as `paths`.
+    """
+    # Never fork: the caller may be the threaded API server
+    mp_context = multiprocessing.get_context(
+        "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=_init_pdf_worker,
+        initargs=(language,),
+    ) as ex:
+        return list(ex.map(partial(generate_pdf, language=language), paths, chunksize=4))
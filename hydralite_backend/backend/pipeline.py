@@ -0,0 +1,310 @@
+import os
+import re
+import json
+import time
+import logging
+import subprocess
+import threading
+from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (
+    LOG_FORMAT,
+    FFMPEG_PATH,
+    FFMPEG_TIMEOUT,
+    TRANSCRIPTS_DIR,
+    SUMMARIES_DIR,
+    STATUS_BACKEND,
+    REDIS_URL,
+    STATUS_REDIS_KEY,
+    MAX_CONCURRENT_TRANSLATIONS,
+)
+from json_utils import dump_json
+from assembly_service import transcribe_audio
+from groq_service import generate_summary, warm_summary_prefix
+from language_service import translate_text, translate_batch, clear_translation_cache
+from pdf_service import generate_pdf
+from retry_utils import with_retry
+
+logger = logging.getLogger(__name__)
+
+# Runs inside PIPELINE_POOL worker processes. Workers import this module and
+# the services, never main, so nothing is built at import time: the
+# translation pool and redis client are created on first use.
+
+# ================= WORKER STATE =================
+# Set by init_worker from the objects the API process hands to the pool
+_status_forward = None
+_cache_generation = None
+_cache_generation_seen = 0
+
+_translation_pool = None
+_redis = None
+
+def init_worker(status_queue, cache_generation):
+    """Pipeline worker initializer: logging, status forwarding, cache counter"""
+    global _status_forward, _cache_generation
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    _status_forward = status_queue
+    _cache_generation = cache_generation
+
+def _get_translation_pool() -> ThreadPoolExecutor:
+    """Bounded fan-out for per-field translation, created on first use"""
+    global _translation_pool
+    if _translation_pool is None:
+        _translation_pool = ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_TRANSLATIONS,
+            thread_name_prefix="translate"
+        )
+    return _translation_pool
+
+# ================= STATUS =================
+def write_status(data: dict):
+    """Publish a status update from a worker"""
+    global _redis
+    data["timestamp"] = int(time.time())
+    try:
+        if STATUS_BACKEND == "redis":
+            if _redis is None:
+                import redis
+                _redis = redis.Redis.from_url(REDIS_URL)
+            _redis.set(STATUS_REDIS_KEY, json.dumps(data, ensure_ascii=False))
+        elif _status_forward is not None:
+            _status_forward.put(data)
+    except Exception as e:
+        logger.error(f"Failed to write status: {e}")
+
+# ================= AUDIO PREPROCESS =================
+def preprocess_audio(input_path: Path, output_wav: Path):
+    """Preprocess audio file"""
+    try:
+        # ffmpeg streams the conversion, nothing is decoded into Python memory
+        result = subprocess.run(
+            [
+                FFMPEG_PATH, "-y", "-i", str(input_path),
+                "-ac", "1", "-ar", "16000", "-vn", "-f", "wav",
+                str(output_wav)
+            ],
+            capture_output=True,
+            timeout=FFMPEG_TIMEOUT
+        )
+        if result.returncode != 0:
+            stderr = result.stderr.decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"ffmpeg exited with {result.returncode}: {stderr[-500:]}")
+        logger.info(f"Audio preprocessed: {output_wav.name}")
+    except Exception as e:
+        logger.error(f"Audio preprocessing failed: {e}")
+        raise
+
+# ================= ROLE-BASED FORMATTER =================
+def format_role_based_text(utterances):
+    """Format transcript with speaker roles"""
+    if not utterances:
+        return ""
+
+    # Single pass: accumulate speaker lengths and keep (speaker, text) pairs
+    speaker_lengths = defaultdict(int)
+    items = []
+    for u in utterances:
+        speaker, text = u["speaker"], u["text"]
+        speaker_lengths[speaker] += len(text)
+        items.append((speaker, text))
+
+    # The speaker who talks most is assumed to be the doctor
+    doctor = max(speaker_lengths, key=speaker_lengths.get)
+
+    return "\n".join(
+        ("Doctor: " if speaker == doctor else "Patient: ") + text
+        for speaker, text in items
+    )
+
+# Devanagari block; compiled once, scanned by the C regex engine
+_HINDI_RE = re.compile("[\u0900-\u097F]")
+
+def detect_language_from_text(text: str) -> str:
+    """Detect language from text"""
+    return "hi" if _HINDI_RE.search(text, 0, 2000) else "en"
+
+# ================= SUMMARY TRANSLATION =================
+# Numbers and bare doses ("500", "2.5 mg", "10ml") read the same in every language
+_NON_TRANSLATABLE_RE = re.compile(r"[\d.,/\s]+(mg|mcg|ml|g|iu)?", re.IGNORECASE)
+
+def _needs_translation(value) -> bool:
+    """Skip Groq for non-strings, very short tokens ("BD", "OD") and doses"""
+    if not isinstance(value, str):
+        return False
+    text = value.strip()
+    return len(text) >= 3 and not _NON_TRANSLATABLE_RE.fullmatch(text)
+
+def _sync_translation_cache():
+    """Clear this worker's translation cache if an admin cleared it since"""
+    global _cache_generation_seen
+    if _cache_generation is None:
+        return
+    generation = _cache_generation.value
+    if generation != _cache_generation_seen:
+        entries = clear_translation_cache()
+        _cache_generation_seen = generation
+        logger.info(f"Translation cache cleared in worker {os.getpid()}: {entries} entries")
+
+def translate_summary(summary: dict, language: str) -> dict:
+    """Translate all summary values in a single batched request"""
+    _sync_translation_cache()
+
+    flat = {}
+    for v in summary.values():
+        for item in (v if isinstance(v, list) else [v]):
+            if _needs_translation(item):
+                flat[str(len(flat) + 1)] = item
+
+    try:
+        translated = iter(translate_batch(flat, language).values())
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Batch translation failed, translating per field: {e}")
+        translated = _get_translation_pool().map(
+            lambda text: translate_text(text, language), flat.values()
+        )
+
+    def unflatten(item):
+        return next(translated) if _needs_translation(item) else item
+
+    return {
+        k: [unflatten(i) for i in v] if isinstance(v, list) else unflatten(v)
+        for k, v in summary.items()
+    }
+
+# ================= CORE PIPELINE =================
+def process_audio_pipeline(wav_path: Path, base_name: str, source: str) -> bool:
+    """Main audio processing pipeline"""
+    try:
+        logger.info(f"Starting pipeline for: {base_name} (source: {source})")
+        
+        # TRANSCRIPTION
+        write_status({
+            "source": source,
+            "file": base_name,
+            "stage": "transcribing",
+            "message": "Transcribing audio...",
+            "progress": 20
+        })
+
+        # Prime Groq's prompt cache while AssemblyAI is busy
+        threading.Thread(target=warm_summary_prefix, daemon=True).start()
+
+        def transcribe():
+            result = transcribe_audio(str(wav_path))
+            if not result or not result.text or not result.text.strip():
+                raise RuntimeError("Transcription failed or empty")
+            return result
+
+        transcript = with_retry(transcribe, attempts=2, base=2, retry_on=(Exception,))
+
+        language = detect_language_from_text(transcript.text)
+        logger.info(f"Detected language: {language}")
+
+        write_status({
+            "source": source,
+            "file": base_name,
+            "stage": "transcribing",
+            "message": "Processing transcript...",
+            "progress": 40
+        })
+
+        utterances = [
+            {
+                "speaker": u.speaker,
+                "text": u.text,
+                "start_ms": u.start,
+                "end_ms": u.end
+            }
+            for u in (getattr(transcript, "utterances", None) or [])
+        ]
+
+        role_based_text = format_role_based_text(utterances)
+
+        transcript_json = {
+            "audio_file": base_name,
+            "language": language,
+            "full_text": role_based_text,
+            "utterances": utterances
+        }
+
+        tpath = TRANSCRIPTS_DIR / f"{base_name}.json"
+        dump_json(transcript_json, tpath)
+
+        # SUMMARY
+        write_status({
+            "source": source,
+            "file": base_name,
+            "language": language,
+            "stage": "summarizing",
+            "message": "Generating summary...",
+            "progress": 60
+        })
+
+        summary_en = generate_summary(transcript_json)
+        if not summary_en:
+            raise RuntimeError("Summary generation failed")
+
+        write_status({
+            "source": source,
+            "file": base_name,
+            "language": language,
+            "stage": "summarizing",
+            "message": "Translating summary..." if language != "en" else "Finalizing summary...",
+            "progress": 75
+        })
+
+        if language != "en":
+            summary_final = translate_summary(summary_en, language)
+        else:
+            summary_final = summary_en
+
+        spath = SUMMARIES_DIR / f"{base_name}_summary.json"
+        dump_json(summary_final, spath)
+
+        # PDF
+        write_status({
+            "source": source,
+            "file": base_name,
+            "language": language,
+            "stage": "generating_pdf",
+            "message": "Creating PDF report...",
+            "progress": 90
+        })
+
+        generate_pdf(str(spath), language=language, base_name=f"{base_name}_summary")
+
+        write_status({
+            "source": source,
+            "file": base_name,
+            "language": language,
+            "stage": "completed",
+            "message": "Processing complete!",
+            "progress": 100
+        })
+
+        logger.info(f"Pipeline completed: {base_name}")
+        return True
+
+    except Exception as e:
+        logger.error(f"Pipeline error for {base_name}: {e}", exc_info=True)
+        write_status({
+            "source": source,
+            "file": base_name,
+            "stage": "error",
+            "message": f"Error: {str(e)}",
+            "error": str(e),
+            "progress": 0
+        })
+        return False
+
+def process_task_entry(raw_path: Path, wav_path: Path, base_name: str, source: str) -> bool:
+    """Worker process entry point: preprocess audio then run the pipeline"""
+    try:
+        preprocess_audio(raw_path, wav_path)
+        return process_audio_pipeline(wav_path, base_name, source)
+    except Exception as e:
+        logger.error(f"Background processing failed: {e}", exc_info=True)
+        return False
@@ -0,0 +1,55 @@
+import time
+import random
+import logging
+import httpx
+import groq
+
+logger = logging.getLogger(__name__)
+
+# ================= RETRYABLE ERRORS =================
+# Rate limits, 5xx and network failures are transient; anything else
+# (bad request, auth, invalid output) fails immediately
+RETRYABLE_ERRORS = (
+    groq.RateLimitError,
+    groq.InternalServerError,
+    groq.APIConnectionError,
+    httpx.TransportError,
+    TimeoutError,
+)
+
+# ================= RETRY WITH BACKOFF =================
+MAX_DELAY = 30
+
+def _retry_after(e):
+    """Seconds from a 429's Retry-After header, or None if absent/unparseable"""
+    if not isinstance(e, groq.RateLimitError):
+        return None
+    try:
+        return max(0.0, float(e.response.headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
+def with_retry(fn, *args, attempts=4, base=0.5, jitter=0.3, retry_on=RETRYABLE_ERRORS, **kwargs):
+    """
+    Call fn(*args, **kwargs), retrying on transient errors.
+
+    Sleeps base * 2^attempt plus random jitter (capped at 30s) between
+    attempts so concurrent callers do not retry in lockstep. Rate limits
+    wait for the server's Retry-After instead, under the same cap.
+    The last error is re-raised once attempts are exhausted.
+    """
+    for attempt in range(attempts):
+        try:
+            return fn(*args, **kwargs)
+        except retry_on as e:
+            if attempt == attempts - 1:
+                raise
+            delay = _retry_after(e)
+            if delay is None:
+                delay = base * 2 ** attempt + random.random() * jitter
+            delay = min(MAX_DELAY, delay)
+            logger.warning(
+                f"{getattr(fn, '__name__', 'call')} failed "
+                f"(attempt {attempt + 1}/{attempts}), retrying in {delay:.1f}s: {e}"
+            )
+            time.sleep(delay)